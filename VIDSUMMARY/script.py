@@ -9,51 +9,200 @@ Usage:
     python vidsum.py --input_folder ./test --output_folder ./output
 """
 
+import importlib.util
 import os
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import re
 import argparse
+import hashlib
+import shutil
+import asyncio
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import time
+import tempfile
 
 # Try to import required libraries, suggest installation if not found
 try:
     import groq
+    import httpx
     from tqdm import tqdm
+    from tqdm.asyncio import tqdm as async_tqdm
     from dotenv import load_dotenv
+    from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
 except ImportError:
     print("Required packages not found! Please install them:")
-    print("pip install groq tqdm python-dotenv")
+    print("pip install groq tqdm python-dotenv tenacity")
     exit(1)
 
+# Optional: only needed for --trim_silence
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv'}
+
+# Short videos are concatenated into batches of at most this much audio per Whisper request
+BATCH_MAX_SECONDS = 20 * 60
+# Silence inserted between clips in a batch, so segments don't straddle two videos
+BATCH_SILENCE_SECONDS = 2.0
+
+# Audio longer than this is split at pauses into ~CHUNK_TARGET_SECONDS pieces transcribed in parallel
+LONG_AUDIO_SECONDS = 15 * 60
+CHUNK_TARGET_SECONDS = 10 * 60
+# How far from each target boundary to look for a pause to split on
+CHUNK_SEARCH_SECONDS = 60
+
+# HTTP/2 lets concurrent requests share one connection; it needs the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+# Long uploads and transcriptions need generous read/write timeouts; pool waits are unbounded
+HTTP_TIMEOUT = httpx.Timeout(connect=10, read=600, write=600, pool=None)
+
+# Voice activity detection settings for --trim_silence (webrtcvad accepts 10/20/30 ms frames)
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+# Non-speech kept on either side of speech, so words at the edges aren't clipped
+VAD_PADDING_MS = 300
+# 0 (least aggressive about filtering out non-speech) to 3 (most aggressive)
+VAD_AGGRESSIVENESS = 2
+
+# Audio formats Groq's Whisper endpoint accepts directly, with the MIME type to upload them as
+WHISPER_MIME_TYPES = {
+    ".ogg": "audio/ogg",
+    ".opus": "audio/ogg",
+    ".mp3": "audio/mpeg",
+    ".m4a": "audio/mp4",
+    ".flac": "audio/flac",
+    ".wav": "audio/wav",
+    ".webm": "audio/webm",
+}
+
+# Summary prompt, built once; each request only concatenates the transcript between the two parts
+PROMPT_PREFIX = """Please create a comprehensive summary (as markdown) of the following transcript. 
+Do not miss any important information, facts, or key points from the original content.
+Include all relevant details, names, dates, and specific information mentioned.
+If any programming commands or terms or instructions are mentioned, add that to a cheatsheet (as a markdown table) that you will include at the end of the summary as implied from the transcript, if applicable; if not, do not even mention the cheatsheet.
+The commands in the cheat sheet must be up to date and correct.
+Do not ask questions, explain what you're doing, or include any commentary (e.g, "Here is a comprehensive summary", or "The transcript is as follows". Simply start with the content). 
+Output only the final message as a readable Markdown Document — nothing else.
+
+TRANSCRIPT:
+"""
+PROMPT_SUFFIX = """
+
+COMPREHENSIVE SUMMARY:
+"""
+# Final step for long transcripts: merge the summaries of each part into one document
+REDUCE_PROMPT_PREFIX = """The following are summaries (as markdown) of consecutive parts of a single transcript, in order.
+Merge them into one comprehensive summary (as markdown) of the whole transcript.
+Do not miss any important information, facts, or key points from any of the parts, and remove repetition between them.
+If the parts include cheatsheets, combine them into a single cheatsheet (as a markdown table) at the end of the summary; if none do, do not even mention the cheatsheet.
+Do not ask questions, explain what you're doing, or include any commentary (e.g, "Here is a comprehensive summary", or "The summaries are as follows". Simply start with the content). 
+Output only the final message as a readable Markdown Document — nothing else.
+
+PART SUMMARIES:
+"""
+# Used when single part summaries are too long to merge with their neighbours: shorten one on its own
+CONDENSE_PROMPT_PREFIX = """The following is a summary (as markdown) of one part of a longer transcript.
+Rewrite it to be about half as long, keeping every important fact, name, date, and key point, and any cheatsheet.
+Do not ask questions, explain what you're doing, or include any commentary. Simply start with the content.
+Output only the final message as a readable Markdown Document — nothing else.
+
+SUMMARY:
+"""
+
+# Bump whenever the summary prompt changes so cached summaries are regenerated
+PROMPT_VERSION = "3"
+
+# Rough token estimate for English text, used to decide how to summarize a transcript
+CHARS_PER_TOKEN = 4
+# Transcripts shorter than this are used as their own summary
+SHORT_TRANSCRIPT_TOKENS = 200
+# Transcripts longer than this would overflow the default model's 8192-token context once the
+# prompt and answer are added, so they're summarized in parts of SUMMARY_CHUNK_TOKENS and merged
+LONG_TRANSCRIPT_TOKENS = 6500
+SUMMARY_CHUNK_TOKENS = 4000
+
+logger = logging.getLogger(__name__)
+
 # Load environment variables from .env file if it exists
 dotenv_path = Path('.env')
 if dotenv_path.exists():
     load_dotenv(dotenv_path)
 
+def setup_logging(verbose: bool):
+    """
+    Route log records through a queue to a single writer thread, so concurrent tasks never
+    block on (or interleave partial writes to) stderr.
+    """
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", datefmt="%H:%M:%S"))
+    listener = QueueListener(log_queue, handler)
+    
+    # Attach to the root logger, but only raise our own level so library debug logs stay quiet
+    logging.getLogger().addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    
+    listener.start()
+    atexit.register(listener.stop)
+
 def setup_conda_env():
     """Guide user to set up a conda environment."""
     print("\n=== Conda Environment Setup Guide ===")
     print("To create a dedicated conda environment for this project:")
     print("1. Run: conda create -y -n vidsummary python=3.10")
     print("2. Activate it: conda activate vidsummary")
-    print("3. Install packages: pip install groq tqdm python-dotenv")
+    print("3. Install packages: pip install groq tqdm python-dotenv tenacity")
     print("4. Set your Groq API key: export GROQ_API_KEY=your_api_key_here")
     print("============================================\n")
 
 def check_ffmpeg() -> bool:
     """Check if FFmpeg is installed and available."""
     try:
-        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         return True
     except FileNotFoundError:
         return False
 
+def iter_videos(root: Path) -> Iterator[Path]:
+    """
+    Recursively yield the video files under root. Uses os.scandir, whose directory entries
+    already know their type, so no per-file stat() or Path allocation is needed while scanning.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS:
+                    yield Path(entry.path)
+
+def list_audio_files(audio_folder: Path) -> Set[str]:
+    """Return the names of the files in the audio folder, read with a single directory scan."""
+    with os.scandir(audio_folder) as entries:
+        return {entry.name for entry in entries}
+
+def atomic_write(path: Path, text: str):
+    """
+    Write text as UTF-8 via a temporary file and os.replace, so an interrupted run never leaves
+    a half-written output behind (and a hard-linked cache entry is replaced, never modified).
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
 def extract_audio(video_path: Path, audio_path: Path) -> Path:
     """Extract audio from video using FFmpeg with optimized size."""
-    print(f"Extracting audio from {video_path} to {audio_path}")
-    
     # Using opus format in ogg container for maximum compression while maintaining quality
     # Opus is designed specifically for voice at low bitrates
     opus_path = audio_path.with_suffix('.ogg')
@@ -61,6 +210,7 @@ def extract_audio(video_path: Path, audio_path: Path) -> Path:
     # Command to extract and compress audio efficiently
     cmd = [
         "ffmpeg", 
+        "-loglevel", "error",
         "-i", str(video_path),
         "-vn",                # No video
         "-c:a", "libopus",    # Use opus codec (excellent for speech at low bitrates)
@@ -69,25 +219,79 @@ def extract_audio(video_path: Path, audio_path: Path) -> Path:
         "-ar", "16000",       # 16kHz sample rate (standard for speech recognition)
         "-application", "voip", # Optimize for voice
         "-compression_level", "10", # Maximum compression
+        # Bit-exact output (fixed Ogg serial number, no encoder tag or source metadata), so the same
+        # audio always produces the same bytes and the content-hash cache key is stable
+        "-fflags", "+bitexact",
+        "-flags:a", "+bitexact",
+        "-map_metadata", "-1",
         "-y",                 # Overwrite output file
         str(opus_path)
     ]
     
-    subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # With -loglevel error, stderr only carries the error text, which _extract_one reports
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
     
     # Check if Groq accepts opus format directly; if not, we'll need to convert to WAV
     # but we can still benefit from the smaller storage footprint until transcription time
     return opus_path
 
+def _extract_one(paths: Tuple[Path, Path]) -> Optional[str]:
+    """
+    Worker for extract_all_audio. Returns an error message instead of raising, so one bad video
+    doesn't abort the whole pool; the parent process does the logging.
+    """
+    video_path, audio_path = paths
+    try:
+        extract_audio(video_path, audio_path)
+        return None
+    except subprocess.CalledProcessError as e:
+        message = f"Error extracting audio from {video_path}: {e}"
+        if e.stderr:
+            message += f"\n  - FFmpeg: {e.stderr.strip()}"
+        return message
+
+def extract_all_audio(video_paths: List[Path], audio_folder: Path) -> Set[Path]:
+    """
+    Extract audio for every video that doesn't have it yet, using one FFmpeg process per CPU core.
+    Encoding is CPU-bound, so this is much faster than extracting one video at a time.
+    Returns the videos whose extraction failed.
+    """
+    existing_audio = list_audio_files(audio_folder)
+    pairs = []
+    queued = {}
+    for video_path in video_paths:
+        audio_name = f"{video_path.stem}.ogg"
+        if audio_name in existing_audio:
+            continue
+        # Audio is named by stem alone, so same-named videos in different subfolders share one file;
+        # extract it once rather than having two FFmpeg processes write it at the same time
+        if audio_name in queued:
+            logger.warning(f"{video_path} has the same name as {queued[audio_name]}; reusing its audio")
+            continue
+        queued[audio_name] = video_path
+        pairs.append((video_path, audio_folder / audio_name))
+    
+    failed = set()
+    if not pairs:
+        return failed
+    
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(_extract_one, pairs)
+        for (video_path, _), error in zip(pairs, tqdm(results, total=len(pairs), desc="Extracting audio")):
+            if error:
+                logger.error(error)
+                failed.add(video_path)
+    return failed
+
 def get_audio_for_transcription(audio_path: Path) -> Path:
     """
     Ensure the audio is in a format compatible with Groq's Whisper API.
     Returns the path to the compatible audio file.
     """
-    # If the file is already in a format we know Whisper accepts (like WAV), return it
-    if audio_path.suffix.lower() == '.wav':
+    # If the file is already in a format Whisper accepts (including our Opus/Ogg), upload it as-is
+    if audio_path.suffix.lower() in WHISPER_MIME_TYPES:
         return audio_path
-        
+    
     # Otherwise, convert to WAV for transcription
     wav_path = audio_path.with_suffix('.wav')
     
@@ -95,6 +299,7 @@ def get_audio_for_transcription(audio_path: Path) -> Path:
     if not wav_path.exists():
         cmd = [
             "ffmpeg",
+            "-loglevel", "error",
             "-i", str(audio_path),
             "-ar", "16000",    # 16kHz sample rate
             "-ac", "1",        # Mono audio
@@ -102,49 +307,203 @@ def get_audio_for_transcription(audio_path: Path) -> Path:
             "-y",              # Overwrite output file
             str(wav_path)
         ]
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     
     return wav_path
 
-def transcribe_audio(client, audio_path: Path, transcript_path: Path, model: str) -> Optional[str]:
+# Transient API failures (rate limits, dropped connections, server errors) are retried with
+# jittered exponential backoff so a burst of concurrent requests doesn't lose work
+retry_transient = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_random_exponential(multiplier=1, max=30),
+    retry=retry_if_exception_type((groq.RateLimitError, groq.APIConnectionError, groq.InternalServerError)),
+    reraise=True
+)
+
+@retry_transient
+async def _do_transcribe(client, file_data, model: str, **kwargs):
+    """Send one Whisper request. `file_data` is a (name, file or bytes, mimetype) tuple."""
+    # Rewind file handles so a retried attempt uploads the whole file again
+    if hasattr(file_data[1], "seek"):
+        file_data[1].seek(0)
+    return await client.audio.transcriptions.create(model=model, file=file_data, **kwargs)
+
+@retry_transient
+async def _do_summarize(client, prompt: str, model: str):
+    """Send one chat completion request."""
+    return await client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}]
+    )
+
+def find_silences(audio_path: Path) -> List[float]:
+    """Return the midpoints (in seconds) of the silent stretches in an audio file."""
+    cmd = [
+        "ffmpeg",
+        "-i", str(audio_path),
+        "-af", "silencedetect=noise=-35dB:d=0.5",
+        "-f", "null",
+        "-"
+    ]
+    # silencedetect reports its findings on stderr
+    log = subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True).stderr
+    starts = [float(value) for value in re.findall(r"silence_start: (-?[\d.]+)", log)]
+    ends = [float(value) for value in re.findall(r"silence_end: ([\d.]+)", log)]
+    return [(start + end) / 2 for start, end in zip(starts, ends)]
+
+def chunk_audio_by_silence(audio_path: Path, work_dir: Path,
+                           target_secs: float = CHUNK_TARGET_SECONDS) -> List[Tuple[Path, float]]:
+    """
+    Split audio into chunks of roughly target_secs, cutting at the pause closest to each boundary
+    (or exactly on the boundary if there's no pause nearby). Returns (chunk_path, offset) pairs.
+    """
+    duration = get_audio_duration(audio_path)
+    silences = find_silences(audio_path)
+    
+    split_points = [0.0]
+    while duration - split_points[-1] > target_secs * 1.5:
+        target = split_points[-1] + target_secs
+        nearby = [s for s in silences if abs(s - target) <= CHUNK_SEARCH_SECONDS]
+        split_points.append(min(nearby, key=lambda s: abs(s - target)) if nearby else target)
+    split_points.append(duration)
+    
+    chunks = []
+    for i, (start, end) in enumerate(zip(split_points, split_points[1:])):
+        chunk_path = work_dir / f"{audio_path.stem}_{i:03d}.ogg"
+        cmd = [
+            "ffmpeg",
+            "-loglevel", "error",
+            "-ss", f"{start:.3f}",
+            "-t", f"{end - start:.3f}",
+            "-i", str(audio_path),
+            "-c", "copy",         # Opus packets can be cut without re-encoding
+            "-y",
+            str(chunk_path)
+        ]
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        chunks.append((chunk_path, start))
+    
+    return chunks
+
+async def transcribe_in_chunks(client, audio_path: Path, model: str, upload_semaphore: asyncio.Semaphore,
+                               trim_silence: bool = False) -> str:
+    """
+    Transcribe a long recording by sending its chunks to Whisper concurrently and joining the text.
+    upload_semaphore is shared across videos so chunk uploads stay within --concurrency.
+    With trim_silence, each chunk has its silence cut out before it is uploaded.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        chunks = await asyncio.to_thread(chunk_audio_by_silence, audio_path, Path(work_dir))
+        logger.info(f"Split {audio_path.name} into {len(chunks)} chunks")
+        
+        async def transcribe_chunk(chunk_path: Path) -> str:
+            async with upload_semaphore:
+                if trim_silence:
+                    audio_data = await asyncio.to_thread(trim_silence_to_memory, chunk_path)
+                    response = await _do_transcribe(client, (chunk_path.name, audio_data, "audio/ogg"), model)
+                else:
+                    with open(chunk_path, "rb") as chunk_file:
+                        response = await _do_transcribe(client, (chunk_path.name, chunk_file, "audio/ogg"), model)
+            return response.text.strip()
+        
+        texts = await asyncio.gather(*[transcribe_chunk(chunk_path) for chunk_path, _ in chunks])
+    
+    return " ".join(texts)
+
+def remove_silence(pcm: bytes) -> bytes:
+    """
+    Drop the non-speech parts of 16-bit mono PCM audio using WebRTC voice activity detection.
+    Returns the input unchanged if no speech is detected at all.
+    """
+    vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    frame_bytes = VAD_SAMPLE_RATE * VAD_FRAME_MS // 1000 * 2  # 2 bytes per sample
+    frames = [pcm[i:i + frame_bytes] for i in range(0, len(pcm) - frame_bytes + 1, frame_bytes)]
+    
+    # Keep every speech frame plus VAD_PADDING_MS of context around it
+    padding = VAD_PADDING_MS // VAD_FRAME_MS
+    keep = [False] * len(frames)
+    for i, frame in enumerate(frames):
+        if vad.is_speech(frame, VAD_SAMPLE_RATE):
+            start, end = max(0, i - padding), min(len(frames), i + padding + 1)
+            keep[start:end] = [True] * (end - start)
+    
+    if not any(keep):
+        return pcm
+    return b"".join(frame for frame, kept in zip(frames, keep) if kept)
+
+def trim_silence_to_memory(source_path: Path) -> bytes:
+    """Decode audio to PCM, cut out the silence, and re-encode what's left as an Ogg/Opus buffer."""
+    decode_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-i", str(source_path),
+        "-vn",
+        "-ac", "1",
+        "-ar", str(VAD_SAMPLE_RATE),
+        "-f", "s16le",        # Raw 16-bit PCM, the input webrtcvad expects
+        "pipe:1"
+    ]
+    pcm = subprocess.run(decode_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+    
+    encode_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-f", "s16le",
+        "-ar", str(VAD_SAMPLE_RATE),
+        "-ac", "1",
+        "-i", "pipe:0",
+        "-c:a", "libopus",
+        "-b:a", "16k",
+        "-application", "voip",
+        "-f", "ogg",
+        "pipe:1"
+    ]
+    return subprocess.run(encode_cmd, input=remove_silence(pcm), check=True,
+                          stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
+
+async def transcribe_audio(client, video_path: Path, audio_path: Path, transcript_path: Path,
+                           model: str, upload_semaphore: asyncio.Semaphore,
+                           trim_silence: bool = False) -> Optional[str]:
     """Transcribe audio using Groq's Whisper API."""
-    print(f"Transcribing {audio_path}")
+    logger.info(f"Transcribing {video_path}")
     
     try:
-        # Ensure the audio is in a compatible format for Groq's API
-        compatible_audio_path = get_audio_for_transcription(audio_path)
-        
-        # For Groq's API, we need to send the file in a specific way
-        with open(compatible_audio_path, "rb") as audio_file:
-            # Create a file-like object with a name attribute to help with MIME type detection
-            from io import BytesIO
-            file_data = BytesIO(audio_file.read())
-            file_data.name = str(compatible_audio_path)  # This helps with MIME type detection
-            
-            response = client.audio.transcriptions.create(
-                model=model,
-                file=file_data
-            )
+        if await asyncio.to_thread(get_audio_duration, audio_path) > LONG_AUDIO_SECONDS:
+            # Long recordings are split at pauses and the pieces transcribed (and trimmed) in parallel
+            transcript_text = await transcribe_in_chunks(client, audio_path, model, upload_semaphore, trim_silence)
+        elif trim_silence:
+            # Only upload the parts with speech; Whisper time is billed per second of audio
+            audio_data = await asyncio.to_thread(trim_silence_to_memory, audio_path)
+            logger.debug(f"Uploading {human_size(len(audio_data))} of trimmed audio for {video_path.name}")
+            response = await _do_transcribe(client, (f"{video_path.stem}.ogg", audio_data, "audio/ogg"), model)
+            transcript_text = response.text
+        else:
+            # Upload the already-extracted Opus audio; Whisper accepts it without re-encoding
+            compatible_audio_path = await asyncio.to_thread(get_audio_for_transcription, audio_path)
             
-        transcript_text = response.text
+            # Pass the open file handle so the SDK streams it instead of holding a copy in memory
+            mime_type = WHISPER_MIME_TYPES[compatible_audio_path.suffix.lower()]
+            with open(compatible_audio_path, "rb") as audio_file:
+                response = await _do_transcribe(client, (compatible_audio_path.name, audio_file, mime_type), model)
+            transcript_text = response.text
         
         # Write transcript to file
-        with open(transcript_path, "w") as f:
-            f.write(transcript_text)
+        atomic_write(transcript_path, transcript_text)
         
         return transcript_text
     except Exception as e:
-        print(f"Error transcribing {audio_path}: {e}")
+        logger.error(f"Error transcribing {video_path}: {e}")
         # Add more detailed error handling for common issues
         if "file must be one of the following types" in str(e):
-            print("  - This error suggests the audio file format is not recognized.")
-            print("  - Let's try converting to a different format...")
+            logger.error("  - This error suggests the audio file format is not recognized.")
+            logger.info("  - Let's try converting to a different format...")
             
             # Try converting to WAV format with standard parameters
             wav_path = audio_path.with_suffix('.wav')
             try:
                 convert_cmd = [
                     "ffmpeg",
+                    "-loglevel", "error",
                     "-i", str(audio_path),
                     "-ar", "16000",  # 16kHz sample rate
                     "-ac", "1",      # Mono audio
@@ -152,79 +511,369 @@ def transcribe_audio(client, audio_path: Path, transcript_path: Path, model: str
                     "-y",            # Overwrite output file
                     str(wav_path)
                 ]
-                subprocess.run(convert_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                print(f"  - Converted to WAV format: {wav_path}")
+                await asyncio.to_thread(
+                    subprocess.run, convert_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                    text=True
+                )
+                logger.info(f"  - Converted to WAV format: {wav_path}")
                 
-                # Try again with the new format
+                # Try again with the new format, streaming the file handle
                 with open(wav_path, "rb") as wav_file:
-                    file_data = BytesIO(wav_file.read())
-                    file_data.name = str(wav_path)
-                    
-                    response = client.audio.transcriptions.create(
-                        model=model,
-                        file=file_data
-                    )
+                    response = await _do_transcribe(client, (wav_path.name, wav_file, "audio/wav"), model)
                     
                 transcript_text = response.text
                 
                 # Write transcript to file
-                with open(transcript_path, "w") as f:
-                    f.write(transcript_text)
+                atomic_write(transcript_path, transcript_text)
                 
                 return transcript_text
                 
+            except subprocess.CalledProcessError as convert_error:
+                logger.error(f"  - Conversion to WAV failed: {convert_error.stderr.strip()}")
             except Exception as wav_error:
-                print(f"  - Error after conversion attempt: {wav_error}")
+                logger.error(f"  - Error after conversion attempt: {wav_error}")
         
         return None
 
-def summarize_transcript(client, transcript_text: str, summary_path: Path, model: str) -> Optional[str]:
-    """Generate a comprehensive summary from the transcript using Groq's LLM."""
-    print(f"Generating summary using {model}")
+def get_audio_duration(audio_path: Path) -> float:
+    """Get the duration of an audio file in seconds using ffprobe."""
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(audio_path)
+    ]
+    result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return float(result.stdout.strip())
+
+def plan_transcription_batches(durations: Dict[Path, float]) -> List[List[Path]]:
+    """
+    Group videos into batches whose combined audio (plus separating silence) stays under
+    BATCH_MAX_SECONDS. Videos that don't fit alongside at least one other video are left out
+    and transcribed on their own.
+    """
+    batches = []
+    current, current_seconds = [], 0.0
+    for video_path, duration in sorted(durations.items(), key=lambda item: item[1]):
+        added_seconds = duration + (BATCH_SILENCE_SECONDS if current else 0.0)
+        if current and current_seconds + added_seconds > BATCH_MAX_SECONDS:
+            batches.append(current)
+            current, current_seconds = [], 0.0
+            added_seconds = duration
+        if added_seconds > BATCH_MAX_SECONDS:
+            continue
+        current.append(video_path)
+        current_seconds += added_seconds
+    if current:
+        batches.append(current)
+    return [batch for batch in batches if len(batch) > 1]
+
+def concat_audio_to_memory(audio_paths: List[Path], silence_path: Path, work_dir: Path) -> bytes:
+    """Concatenate audio files with silence between them into a single Ogg/Opus buffer."""
+    list_path = work_dir / f"{audio_paths[0].stem}_concat.txt"
+    lines = []
+    for i, audio_path in enumerate(audio_paths):
+        if i > 0:
+            lines.append(f"file '{silence_path.resolve()}'")
+        # Escape single quotes as required by the concat demuxer
+        escaped = str(audio_path.resolve()).replace("'", "'\\''")
+        lines.append(f"file '{escaped}'")
+    list_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
     
-    # Create prompt with instruction to create a detailed, comprehensive summary
-    prompt = f"""Please create a comprehensive summary (as markdown) of the following transcript. 
-Do not miss any important information, facts, or key points from the original content.
-Include all relevant details, names, dates, and specific information mentioned.
-If any programming commands or terms or instructions are mentioned, add that to a cheatsheet (as a markdown table) that you will include at the end of the summary as implied from the transcript, if applicable; if not, do not even mention the cheatsheet.
-The commands in the cheat sheet must be up to date and correct.
-Do not ask questions, explain what you're doing, or include any commentary (e.g, "Here is a comprehensive summary", or "The transcript is as follows". Simply start with the content). 
-Output only the final message as a readable Markdown Document — nothing else.
+    cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-f", "concat",
+        "-safe", "0",
+        "-i", str(list_path),
+        "-c:a", "libopus",
+        "-b:a", "16k",
+        "-ac", "1",
+        "-ar", "16000",
+        "-application", "voip",
+        "-f", "ogg",
+        "pipe:1"
+    ]
+    return subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
 
-TRANSCRIPT:
-{transcript_text}
+def make_silence(silence_path: Path):
+    """Write a short silent clip in the same format as the extracted audio."""
+    cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        "-f", "lavfi",
+        "-i", "anullsrc=r=16000:cl=mono",
+        "-t", str(BATCH_SILENCE_SECONDS),
+        "-c:a", "libopus",
+        "-b:a", "16k",
+        "-application", "voip",
+        "-y",
+        str(silence_path)
+    ]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-COMPREHENSIVE SUMMARY:
-"""
+async def transcribe_batch(client, batch: List[Path], durations: Dict[Path, float], audio_folder: Path,
+                           transcript_folder: Path, cached_paths: Dict[Path, Path], silence_path: Path,
+                           work_dir: Path, model: str) -> List[Path]:
+    """
+    Transcribe several short videos with a single Whisper request and split the result back
+    into per-video transcripts using segment timestamps. Returns the videos that were transcribed.
+    """
+    names = ", ".join(video_path.stem for video_path in batch)
+    logger.info(f"Transcribing batch of {len(batch)} videos: {names}")
+    
+    audio_paths = [audio_folder / f"{video_path.stem}.ogg" for video_path in batch]
+    
+    # Record where each clip starts and ends in the concatenated audio
+    boundaries = []
+    offset = 0.0
+    for video_path in batch:
+        boundaries.append((offset, offset + durations[video_path]))
+        offset += durations[video_path] + BATCH_SILENCE_SECONDS
     
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        # Upload the buffer as-is; wrapping it in a BytesIO would only add another copy
+        audio_data = await asyncio.to_thread(concat_audio_to_memory, audio_paths, silence_path, work_dir)
+        response = await _do_transcribe(client, ("batch.ogg", audio_data, "audio/ogg"), model,
+                                        response_format="verbose_json")
+        segments = getattr(response, "segments", None) or []
+    except Exception as e:
+        logger.error(f"Error transcribing batch ({names}): {e}")
+        return []
+    if not segments:
+        # Without timestamps the text can't be split back per clip; fall back to per-file transcription
+        logger.error(f"Batch response has no segments ({names}); transcribing these files individually")
+        return []
+    
+    # Assign each segment to the clip containing its midpoint; silence gaps go to the nearest clip
+    texts = [[] for _ in batch]
+    for segment in segments:
+        midpoint = (segment["start"] + segment["end"]) / 2
+        index = 0
+        for i, (start, _) in enumerate(boundaries):
+            if midpoint >= start - BATCH_SILENCE_SECONDS / 2:
+                index = i
+        texts[index].append(segment["text"].strip())
+    
+    for video_path, parts in zip(batch, texts):
+        transcript_path = transcript_folder / f"{video_path.stem}.txt"
+        atomic_write(transcript_path, " ".join(parts))
+        link_or_copy(transcript_path, cached_paths[video_path])
+    
+    return batch
+
+async def transcribe_in_batches(client, video_files: List[Path], audio_folder: Path, existing_audio: Set[str],
+                                transcript_folder: Path, cache_folder: Path, model: str, skip_transcription: bool,
+                                semaphore: asyncio.Semaphore) -> List[Path]:
+    """Batch-transcribe short videos; returns the videos whose transcripts were written."""
+    durations = {}
+    cached_paths = {}
+    for video_path in video_files:
+        audio_path = audio_folder / f"{video_path.stem}.ogg"
+        transcript_path = transcript_folder / f"{video_path.stem}.txt"
+        if audio_path.name not in existing_audio or (skip_transcription and transcript_path.exists()):
+            continue
+        
+        # Already-cached videos are left to process_video, which reuses the cached transcript.
+        # Batch transcripts are never trimmed, so they're keyed as untrimmed.
+        audio_hash = await asyncio.to_thread(hash_file, audio_path)
+        cached_paths[video_path] = transcript_cache_path(cache_folder, audio_hash, model, False)
+        if cached_paths[video_path].exists():
+            continue
+        try:
+            durations[video_path] = await asyncio.to_thread(get_audio_duration, audio_path)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            logger.error(f"Could not read duration of {audio_path}: {e}")
+    
+    batches = plan_transcription_batches(durations)
+    if not batches:
+        return []
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        work_dir = Path(work_dir)
+        silence_path = work_dir / "silence.ogg"
+        await asyncio.to_thread(make_silence, silence_path)
+        
+        async def bounded(batch: List[Path]) -> List[Path]:
+            async with semaphore:
+                return await transcribe_batch(client, batch, durations, audio_folder, transcript_folder,
+                                              cached_paths, silence_path, work_dir, model)
+        
+        results = await async_tqdm.gather(*[bounded(batch) for batch in batches], desc="Transcribing batches")
+    
+    return [video_path for batch in results for video_path in batch]
+
+def split_transcript(transcript_text: str, max_chars: int) -> List[str]:
+    """
+    Split a transcript into pieces of at most max_chars, breaking at paragraph boundaries
+    where possible, then at sentence boundaries, and only mid-sentence as a last resort.
+    """
+    # (separator, text) pairs, where the separator is what joined the text to the previous piece
+    pieces = []
+    for paragraph in transcript_text.split("\n\n"):
+        if len(paragraph) <= max_chars:
+            pieces.append(("\n\n", paragraph))
+            continue
+        # Whisper transcripts are often one long paragraph, so fall back to sentences
+        for j, sentence in enumerate(re.split(r"(?<=[.!?])\s+", paragraph)):
+            for i in range(0, len(sentence), max_chars):
+                separator = "" if i else (" " if j else "\n\n")
+                pieces.append((separator, sentence[i:i + max_chars]))
+    
+    # Pack consecutive pieces into chunks as large as possible
+    chunks = []
+    current = ""
+    for separator, piece in pieces:
+        candidate = current + separator + piece if current else piece
+        if len(candidate) > max_chars and current:
+            chunks.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def _summarize_bounded(client, prompt: str, model: str, semaphore: asyncio.Semaphore) -> str:
+    """Send one summary request while holding a slot of the shared semaphore; returns the text."""
+    async with semaphore:
+        response = await _do_summarize(client, prompt, model)
+    return response.choices[0].message.content
+
+async def reduce_summaries(client, part_summaries: List[str], model: str, semaphore: asyncio.Semaphore) -> str:
+    """
+    Merge the summaries of consecutive transcript parts into one. If they are too long to merge
+    in a single request, neighbouring summaries are merged in groups first, level by level.
+    Raises ValueError if a summary can't be made short enough to fit in a request.
+    """
+    separator = "\n\n---\n\n"
+    max_chars = LONG_TRANSCRIPT_TOKENS * CHARS_PER_TOKEN
+    while len(part_summaries) > 1 and len(separator.join(part_summaries)) > max_chars:
+        # Pack consecutive summaries into groups that each fit in one request
+        groups = [[]]
+        for part in part_summaries:
+            if groups[-1] and len(separator.join(groups[-1] + [part])) > max_chars:
+                groups.append([])
+            groups[-1].append(part)
         
-        summary_text = response.choices[0].message.content
+        if len(groups) == len(part_summaries):
+            # No two summaries fit together, so grouping can't shrink the input; condense the
+            # oversized ones on their own first
+            too_long = [part for part in part_summaries if len(part) > max_chars]
+            if too_long:
+                raise ValueError(f"Part summary of {len(too_long[0])} characters exceeds the "
+                                 f"{max_chars}-character request limit")
+            oversized = [i for i, part in enumerate(part_summaries) if len(part) > (max_chars - len(separator)) // 2]
+            logger.info(f"Condensing {len(oversized)} part summaries that are too long to merge")
+            condensed = await asyncio.gather(*[
+                _summarize_bounded(client, CONDENSE_PROMPT_PREFIX + part_summaries[i] + PROMPT_SUFFIX, model, semaphore)
+                for i in oversized
+            ])
+            if all(len(new) >= len(part_summaries[i]) for i, new in zip(oversized, condensed)):
+                raise ValueError("Part summaries could not be condensed enough to merge")
+            part_summaries = list(part_summaries)
+            for i, new in zip(oversized, condensed):
+                part_summaries[i] = min(new, part_summaries[i], key=len)
+            continue
+        
+        logger.info(f"Merging {len(part_summaries)} part summaries in {len(groups)} groups")
+        part_summaries = await asyncio.gather(*[
+            _summarize_bounded(client, REDUCE_PROMPT_PREFIX + separator.join(group) + PROMPT_SUFFIX, model, semaphore)
+            for group in groups
+        ])
+    
+    if len(part_summaries) == 1:
+        return part_summaries[0]
+    return await _summarize_bounded(client, REDUCE_PROMPT_PREFIX + separator.join(part_summaries) + PROMPT_SUFFIX,
+                                    model, semaphore)
+
+async def summarize_transcript(client, transcript_text: str, summary_path: Path, model: str,
+                               semaphore: asyncio.Semaphore) -> Optional[str]:
+    """
+    Generate a comprehensive summary from the transcript using Groq's LLM. Very short transcripts
+    are used as-is; very long ones are summarized in parallel parts whose summaries are then merged.
+    Every request holds a slot of `semaphore`, which is shared across videos.
+    """
+    estimated_tokens = len(transcript_text) // CHARS_PER_TOKEN
+    
+    try:
+        if estimated_tokens < SHORT_TRANSCRIPT_TOKENS:
+            logger.info("Transcript is too short to need summarizing, using it as the summary")
+            summary_text = transcript_text
+        elif estimated_tokens > LONG_TRANSCRIPT_TOKENS:
+            chunks = split_transcript(transcript_text, SUMMARY_CHUNK_TOKENS * CHARS_PER_TOKEN)
+            logger.info(f"Generating summary of {len(chunks)} transcript parts using {model}")
+            
+            # Map: summarize each part concurrently
+            part_summaries = await asyncio.gather(*[
+                _summarize_bounded(client, PROMPT_PREFIX + chunk + PROMPT_SUFFIX, model, semaphore) for chunk in chunks
+            ])
+            
+            # Reduce: merge the part summaries into one
+            summary_text = await reduce_summaries(client, part_summaries, model, semaphore)
+        else:
+            logger.info(f"Generating summary using {model}")
+            
+            # Create prompt with instruction to create a detailed, comprehensive summary
+            prompt = PROMPT_PREFIX + transcript_text + PROMPT_SUFFIX
+            summary_text = await _summarize_bounded(client, prompt, model, semaphore)
         
         # Write summary to file
-        with open(summary_path, "w") as f:
-            f.write(summary_text)
+        atomic_write(summary_path, summary_text)
         
         return summary_text
     except Exception as e:
-        print(f"Error generating summary: {e}")
+        logger.error(f"Error generating summary: {e}")
         return None
 
-def get_audio_file_size(file_path: Path) -> str:
-    """Get human-readable file size of an audio file."""
-    size_bytes = os.path.getsize(file_path)
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0 or unit == 'GB':
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-
-def process_video(client, video_path: Path, audio_folder: Path, transcript_folder: Path, summary_folder: Path, 
-                  transcript_model: str, summary_model: str, skip_transcription: bool, skip_summarization: bool):
-    """Process a single video: extract audio, transcribe, and summarize."""
+def hash_file(file_path: Path) -> str:
+    """Return a short content hash of a file, used as a cache key."""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_text(*parts: str) -> str:
+    """Return a short content hash of some strings, used as a cache key."""
+    digest = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def link_or_copy(src: Path, dst: Path):
+    """Hard-link src to dst (replacing dst), falling back to a copy where links aren't supported."""
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def transcript_cache_path(cache_folder: Path, audio_hash: str, transcript_model: str, trim_silence: bool) -> Path:
+    """
+    Cache location of a transcript. The key covers the audio content and everything else that
+    changes the transcript (model and silence trimming), so switching either never reuses stale text.
+    """
+    trimmed = ".trimmed" if trim_silence else ""
+    return cache_folder / f"{audio_hash}.{transcript_model.replace('/', '_')}{trimmed}.transcript.txt"
+
+def human_size(size_bytes: int) -> str:
+    """Format a byte count as a human-readable size."""
+    units = ['B', 'KB', 'MB', 'GB', 'TB']
+    # bit_length gives the exact power of 1024 without floating-point log rounding
+    exponent = min(len(units) - 1, (max(size_bytes, 1).bit_length() - 1) // 10)
+    return f"{size_bytes / 1024 ** exponent:.2f} {units[exponent]}"
+
+async def process_video(client, video_path: Path, audio_folder: Path, existing_audio: Set[str],
+                  transcript_folder: Path, summary_folder: Path, cache_folder: Path, transcript_model: str,
+                  skip_transcription: bool, trim_silence: bool, summary_queue: asyncio.Queue,
+                  upload_semaphore: asyncio.Semaphore):
+    """
+    Process a single video: extract audio and transcribe it, then hand the transcript
+    to the summarization stage via summary_queue.
+    """
     video_name = video_path.stem
     
     # Define output paths
@@ -232,31 +881,148 @@ def process_video(client, video_path: Path, audio_folder: Path, transcript_folde
     transcript_path = transcript_folder / f"{video_name}.txt"
     summary_path = summary_folder / f"{video_name}_summary.md"
     
-    # Step 1: Extract audio if needed
-    if not audio_path.exists():
-        audio_path = extract_audio(video_path, audio_path)
-        print(f"Audio extracted. File size: {get_audio_file_size(audio_path)}")
+    # Step 1: Extract audio if needed (normally already done by extract_all_audio)
+    if audio_path.name not in existing_audio:
+        # FFmpeg is a blocking subprocess, so keep it off the event loop
+        logger.info(f"Extracting audio from {video_path} to {audio_path}")
+        try:
+            audio_path = await asyncio.to_thread(extract_audio, video_path, audio_path)
+        except subprocess.CalledProcessError as e:
+            # Don't let one bad video abort the other in-flight tasks
+            logger.error(f"Error extracting audio from {video_path}: {e}")
+            return
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Audio extracted. File size: {human_size(os.path.getsize(audio_path))}")
+    
+    # Cache entries are keyed by audio content, so renamed or duplicate videos reuse earlier results
+    audio_hash = await asyncio.to_thread(hash_file, audio_path)
+    cached_transcript_path = transcript_cache_path(cache_folder, audio_hash, transcript_model, trim_silence)
     
     # Step 2: Transcribe audio if needed
     transcript_text = None
     if skip_transcription and transcript_path.exists():
-        print(f"Using existing transcript for {video_name}")
-        with open(transcript_path, "r") as f:
-            transcript_text = f.read()
+        logger.info(f"Using existing transcript for {video_name}")
+        transcript_text = transcript_path.read_text(encoding="utf-8")
+    elif cached_transcript_path.exists():
+        logger.info(f"Using cached transcript for {video_name}")
+        link_or_copy(cached_transcript_path, transcript_path)
+        transcript_text = transcript_path.read_text(encoding="utf-8")
     else:
-        transcript_text = transcribe_audio(client, audio_path, transcript_path, transcript_model)
+        transcript_text = await transcribe_audio(client, video_path, audio_path, transcript_path,
+                                                 transcript_model, upload_semaphore, trim_silence)
+        if transcript_text:
+            link_or_copy(transcript_path, cached_transcript_path)
     
     if not transcript_text:
-        print(f"Failed to get transcript for {video_name}, skipping summarization")
+        logger.error(f"Failed to get transcript for {video_name}, skipping summarization")
         return
     
-    # Step 3: Generate summary if needed
+    # Step 3: Summarize in the background so the next video's transcription can start right away
+    await summary_queue.put((video_name, transcript_text, summary_path))
+
+async def summarize_video(client, video_name: str, transcript_text: str, summary_path: Path, cache_folder: Path,
+                          summary_model: str, skip_summarization: bool, summary_semaphore: asyncio.Semaphore):
+    """Generate the summary for one transcript, reusing an existing or cached summary when possible."""
+    summary_hash = hash_text(transcript_text, summary_model, PROMPT_VERSION)
+    cached_summary_path = cache_folder / f"{summary_hash}.{summary_model.replace('/', '_')}.md"
+    
     if skip_summarization and summary_path.exists():
-        print(f"Using existing summary for {video_name}")
+        logger.info(f"Using existing summary for {video_name}")
+    elif cached_summary_path.exists():
+        logger.info(f"Using cached summary for {video_name}")
+        link_or_copy(cached_summary_path, summary_path)
     else:
-        summary_text = summarize_transcript(client, transcript_text, summary_path, summary_model)
-        if not summary_text:
-            print(f"Failed to generate summary for {video_name}")
+        summary_text = await summarize_transcript(client, transcript_text, summary_path, summary_model,
+                                                  summary_semaphore)
+        if summary_text:
+            link_or_copy(summary_path, cached_summary_path)
+        else:
+            logger.error(f"Failed to generate summary for {video_name}")
+
+async def process_all(client, video_files, audio_folder: Path, transcript_folder: Path,
+                      summary_folder: Path, cache_folder: Path, args: argparse.Namespace):
+    """Process all videos concurrently, with at most `args.concurrency` in flight at once."""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    # Chunk uploads of long recordings get their own limit: a video's task already holds a slot of
+    # `semaphore`, so drawing its chunks from the same one could deadlock
+    upload_semaphore = asyncio.Semaphore(args.concurrency)
+    # Likewise for summary requests: a long transcript is summarized in many parts at once, and
+    # several summary workers run side by side
+    summary_semaphore = asyncio.Semaphore(args.concurrency)
+    
+    # One directory scan instead of an exists() check per video
+    existing_audio = list_audio_files(audio_folder)
+    
+    # Two-stage pipeline: transcription tasks feed a bounded queue drained by summarization workers,
+    # so summaries overlap with the transcription of later videos
+    summary_queue = asyncio.Queue(maxsize=args.concurrency)
+    
+    async def summary_worker():
+        while True:
+            item = await summary_queue.get()
+            if item is None:
+                return
+            video_name, transcript_text, summary_path = item
+            await summarize_video(
+                client, 
+                video_name, 
+                transcript_text, 
+                summary_path, 
+                cache_folder, 
+                args.summary_model, 
+                args.skip_summarization,
+                summary_semaphore
+            )
+    
+    workers = [asyncio.create_task(summary_worker()) for _ in range(args.concurrency)]
+    
+    # Transcribe short videos together first; process_video then reuses those transcripts
+    batched = set()
+    if args.batch_transcription:
+        batched = set(await transcribe_in_batches(
+            client, video_files, audio_folder, existing_audio, transcript_folder, cache_folder,
+            args.transcript_model, args.skip_transcription, semaphore
+        ))
+    
+    async def bounded(video_path: Path):
+        async with semaphore:
+            await process_video(
+                client, 
+                video_path, 
+                audio_folder, 
+                existing_audio, 
+                transcript_folder, 
+                summary_folder, 
+                cache_folder, 
+                args.transcript_model, 
+                args.skip_transcription or video_path in batched, 
+                args.trim_silence, 
+                summary_queue,
+                upload_semaphore
+            )
+    
+    try:
+        await async_tqdm.gather(*[bounded(video_path) for video_path in video_files], desc="Transcribing videos")
+        
+        # Signal the workers to stop once the queue is drained
+        for _ in workers:
+            await summary_queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        # Close the pooled connections while the event loop that owns them is still running
+        await client.close()
+
+def create_client(api_key: str) -> groq.AsyncClient:
+    """
+    Create the Groq client shared by every task, backed by one pooled HTTP client
+    (HTTP/2 when available) so connections and TLS sessions are reused across requests.
+    """
+    async_http = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, retries=0, limits=HTTP_LIMITS),
+        timeout=HTTP_TIMEOUT
+    )
+    # retry_transient is the only retry layer; SDK retries would multiply its attempts
+    return groq.AsyncClient(api_key=api_key, http_client=async_http, max_retries=0)
 
 def main():
     # Configure command line arguments
@@ -268,6 +1034,12 @@ def main():
     parser.add_argument('--summary_model', default='llama3-70b-8192', help='Groq model for summarization')
     parser.add_argument('--skip_transcription', action='store_true', help='Skip transcription if already done')
     parser.add_argument('--skip_summarization', action='store_true', help='Skip summarization if already done')
+    parser.add_argument('--batch_transcription', action='store_true',
+                        help='Combine short videos into shared Whisper requests')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum number of videos to process at once')
+    parser.add_argument('--trim_silence', action='store_true',
+                        help='Cut silence out of the audio before transcription (requires webrtcvad)')
+    parser.add_argument('--verbose', action='store_true', help='Log extra progress details such as audio sizes')
     parser.add_argument('--setup_conda', action='store_true', help='Display conda environment setup instructions')
     args = parser.parse_args()
     
@@ -276,10 +1048,12 @@ def main():
         setup_conda_env()
         return
     
+    setup_logging(args.verbose)
+    
     # Check FFmpeg installation
     if not check_ffmpeg():
-        print("FFmpeg is not installed or not found in PATH.")
-        print("Please install FFmpeg using: brew install ffmpeg")
+        logger.error("FFmpeg is not installed or not found in PATH.")
+        logger.error("Please install FFmpeg using: brew install ffmpeg")
         return
     
     # Create output folders if they don't exist
@@ -287,18 +1061,20 @@ def main():
     transcript_folder = output_folder / "transcripts"
     summary_folder = output_folder / "summaries"
     audio_folder = output_folder / "audio"
+    cache_folder = output_folder / "cache"
     
     os.makedirs(transcript_folder, exist_ok=True)
     os.makedirs(summary_folder, exist_ok=True)
     os.makedirs(audio_folder, exist_ok=True)
+    os.makedirs(cache_folder, exist_ok=True)
     
     # Use environment variable if API key is not provided as argument
     GROQ_API_KEY = args.api_key or os.environ.get("GROQ_API_KEY")
     
     if not GROQ_API_KEY:
-        print("Groq API key is required. Set it using --api_key or GROQ_API_KEY environment variable.")
-        print("You can run: export GROQ_API_KEY=your_api_key_here")
-        print("Or create a .env file in the project root with GROQ_API_KEY=your_api_key_here")
+        logger.error("Groq API key is required. Set it using --api_key or GROQ_API_KEY environment variable.")
+        logger.error("You can run: export GROQ_API_KEY=your_api_key_here")
+        logger.error("Or create a .env file in the project root with GROQ_API_KEY=your_api_key_here")
         return
         
     # Use environment variables for models if not specified in arguments
@@ -308,37 +1084,45 @@ def main():
     if args.summary_model == "llama3-70b-8192" and os.environ.get("SUMMARY_MODEL"):
         args.summary_model = os.environ.get("SUMMARY_MODEL")
     
-    # Initialize Groq client
-    client = groq.Client(api_key=GROQ_API_KEY)
+    if args.concurrency < 1:
+        logger.error("--concurrency must be at least 1")
+        return
+    
+    if args.trim_silence and webrtcvad is None:
+        logger.error("--trim_silence requires the webrtcvad package. Please install it:")
+        logger.error("pip install webrtcvad")
+        return
     
     # Get list of video files
     input_folder = Path(args.input_folder)
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv']
-    video_files = [f for f in input_folder.glob('**/*') if f.suffix.lower() in video_extensions]
+    if not input_folder.is_dir():
+        logger.error(f"Input folder not found: {input_folder}")
+        return
+    video_files = list(iter_videos(input_folder))
     
     if not video_files:
-        print(f"No video files found in {input_folder}")
+        logger.error(f"No video files found in {input_folder}")
         return
     
-    print(f"Found {len(video_files)} video files to process")
-    
-    # Process each video
-    for video_path in tqdm(video_files, desc="Processing videos"):
-        process_video(
-            client, 
-            video_path, 
-            audio_folder, 
-            transcript_folder, 
-            summary_folder, 
-            args.transcript_model, 
-            args.summary_model, 
-            args.skip_transcription, 
-            args.skip_summarization
-        )
-    
-    print("Processing complete!")
-    print(f"Transcripts saved to: {transcript_folder}")
-    print(f"Summaries saved to: {summary_folder}")
+    logger.info(f"Found {len(video_files)} video files to process")
+    
+    # Extract all missing audio up front, in parallel across CPU cores
+    failed = extract_all_audio(video_files, audio_folder)
+    if failed:
+        logger.error(f"Skipping {len(failed)} videos whose audio could not be extracted")
+        video_files = [video_path for video_path in video_files if video_path not in failed]
+    
+    # Initialize Groq client (async so API calls for several videos can overlap);
+    # process_all closes it when done
+    client = create_client(GROQ_API_KEY)
+    
+    # Process videos concurrently
+    asyncio.run(process_all(client, video_files, audio_folder, transcript_folder, summary_folder,
+                            cache_folder, args))
+    
+    logger.info("Processing complete!")
+    logger.info(f"Transcripts saved to: {transcript_folder}")
+    logger.info(f"Summaries saved to: {summary_folder}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file